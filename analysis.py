@@ -3,19 +3,94 @@ Pandas analysis helpers for extracting schema, samples, and stats.
 """
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, Iterable
+import numpy as np
 import pandas as pd
 
 
-def summarize_df(df: pd.DataFrame) -> dict[str, Any]:
-    """Return a summary including schema, head, describe, and row count.
+# Distinct values tracked per non-numeric column when summarizing chunks
+_NUNIQUE_CAP = 10_000
+
+
+def _summarize_chunks(chunks: Iterable[pd.DataFrame]) -> dict[str, Any]:
+    """Summarize a stream of DataFrame chunks without holding them all in memory.
 
-    The schema contains column names and inferred dtypes.
+    Schema comes from the first chunk and head is filled from as many chunks as
+    needed. Numeric columns (as typed in the first chunk) accumulate running
+    count/sum/sum-of-squares/min/max, so they report count, mean, std, min and
+    max (quantiles need the full column). Other columns report count and
+    nunique; nunique is dropped for columns with more than _NUNIQUE_CAP
+    distinct values.
     """
-    schema = [{"column": col, "dtype": str(dtype)} for col, dtype in zip(df.columns, df.dtypes)]
-    head = df.head(5).to_dict(orient="records")
+    first: pd.DataFrame | None = None
+    head: list[dict[str, Any]] = []
+    row_count = 0
+    numeric: list[str] = []
+    counts = pd.Series(dtype="float64")
+    sums = pd.Series(dtype="float64")
+    sum_sqs = pd.Series(dtype="float64")
+    mins = pd.Series(dtype="float64")
+    maxs = pd.Series(dtype="float64")
+    other_counts: dict[str, int] = {}
+    uniques: dict[str, set[Any] | None] = {}
+
+    for chunk in chunks:
+        if first is None:
+            first = chunk
+            numeric = [name for name, dtype in chunk.dtypes.items() if _is_describable(dtype)]
+            other_counts = {name: 0 for name in chunk.columns if name not in numeric}
+            uniques = {name: set() for name in other_counts}
+        if len(head) < 5:
+            head.extend(chunk.head(5 - len(head)).to_dict(orient="records"))
+        row_count += len(chunk)
+
+        for name in other_counts:
+            col = chunk[name]
+            other_counts[name] += int(col.count())
+            seen = uniques[name]
+            if seen is not None:
+                seen.update(col.dropna().unique().tolist())
+                if len(seen) > _NUNIQUE_CAP:
+                    uniques[name] = None
+
+        if not numeric:
+            continue
+        # A later chunk may infer a different dtype for the same column; coerce it
+        num = chunk[numeric].apply(pd.to_numeric, errors="coerce").astype("float64")
+        agg = num.agg(["count", "sum", "min", "max"])
+        counts = counts.add(agg.loc["count"], fill_value=0)
+        sums = sums.add(agg.loc["sum"], fill_value=0)
+        sum_sqs = sum_sqs.add((num * num).sum(), fill_value=0)
+        mins = pd.concat([mins, agg.loc["min"]], axis=1).min(axis=1)
+        maxs = pd.concat([maxs, agg.loc["max"]], axis=1).max(axis=1)
+
+    if first is None or row_count < 1:
+        raise ValueError("CSV must contain at least one row")
+
+    schema = {"columns": first.columns.tolist(), "dtypes": first.dtypes.astype(str).tolist()}
+    describe: dict[str, Any] = {}
     try:
-        describe = df.describe(include="all").fillna("").to_dict()
+        mean = sums / counts
+        # Sample variance (ddof=1) to match DataFrame.describe()
+        var = (sum_sqs - counts * mean * mean) / (counts - 1)
+        std = var.clip(lower=0) ** 0.5
+        for name in first.columns:
+            if name in other_counts:
+                describe[name] = {"count": other_counts[name]}
+                if uniques[name] is not None:
+                    describe[name]["nunique"] = len(uniques[name])
+                continue
+            count = int(counts[name])
+            if not count:
+                describe[name] = {"count": 0, "mean": np.nan, "std": np.nan, "min": np.nan, "max": np.nan}
+                continue
+            describe[name] = {
+                "count": count,
+                "mean": float(mean[name]),
+                "std": float(std[name]) if count > 1 else np.nan,
+                "min": float(mins[name]),
+                "max": float(maxs[name]),
+            }
     except Exception:
         describe = {}
 
@@ -23,6 +98,86 @@ def summarize_df(df: pd.DataFrame) -> dict[str, Any]:
         "schema": schema,
         "head": head,
         "describe": describe,
-        "row_count": int(df.shape[0]),
+        "row_count": row_count,
     }
 
+
+_QUANTILES = (0.25, 0.5, 0.75)
+
+
+def _is_describable(dtype: Any) -> bool:
+    """Match ``select_dtypes("number")``: numeric but not boolean."""
+    return pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+
+
+def _numeric_stats(col: pd.Series) -> dict[str, Any]:
+    """describe()-equivalent stats for one numeric column, computed in one go.
+
+    Arrow-backed columns use pyarrow.compute kernels directly; everything else
+    goes through a single float64 NumPy array.
+    """
+    if isinstance(col.dtype, pd.ArrowDtype):
+        import pyarrow.compute as pc
+
+        arr = col.array.__arrow_array__()
+        count = pc.count(arr).as_py()
+        if not count:
+            return {"count": 0, "mean": np.nan, "std": np.nan, "min": np.nan, "max": np.nan}
+        mm = pc.min_max(arr).as_py()
+        std = pc.stddev(arr, ddof=1).as_py()
+        qs = pc.quantile(arr, q=list(_QUANTILES), interpolation="linear").to_pylist()
+        mean, lo, hi = pc.mean(arr).as_py(), mm["min"], mm["max"]
+    else:
+        values = col.to_numpy(dtype="float64", na_value=np.nan)
+        values = values[~np.isnan(values)]
+        count = int(values.size)
+        if not count:
+            return {"count": 0, "mean": np.nan, "std": np.nan, "min": np.nan, "max": np.nan}
+        std = float(values.std(ddof=1)) if count > 1 else np.nan
+        qs = np.quantile(values, _QUANTILES).tolist()
+        mean, lo, hi = float(values.mean()), float(values.min()), float(values.max())
+    return {
+        "count": count,
+        "mean": mean,
+        "std": np.nan if std is None else std,
+        "min": lo,
+        "25%": qs[0],
+        "50%": qs[1],
+        "75%": qs[2],
+        "max": hi,
+    }
+
+
+def summarize_df(df: pd.DataFrame | Iterable[pd.DataFrame]) -> dict[str, Any]:
+    """Return a summary including schema, head, describe, and row count.
+
+    The schema holds parallel ``columns`` and ``dtypes`` lists. Numeric columns
+    get the usual describe() stats; other columns get count and nunique. Schema
+    and stats are built in a single pass over the columns. ``df`` may also be an
+    iterator of chunks (e.g. from ``load_csv(path, chunksize=...)``), in which
+    case the summary is computed incrementally.
+    """
+    if not isinstance(df, pd.DataFrame):
+        return _summarize_chunks(df)
+
+    head = df.head(5).to_dict(orient="records")
+    columns: list[str] = []
+    dtypes: list[str] = []
+    describe: dict[str, Any] = {}
+    try:
+        for name, col in df.items():
+            columns.append(name)
+            dtypes.append(str(col.dtype))
+            if _is_describable(col.dtype):
+                describe[name] = _numeric_stats(col)
+            else:
+                describe[name] = {"count": int(col.count()), "nunique": int(col.nunique())}
+    except Exception:
+        columns, dtypes, describe = df.columns.tolist(), df.dtypes.astype(str).tolist(), {}
+
+    return {
+        "schema": {"columns": columns, "dtypes": dtypes},
+        "head": head,
+        "describe": describe,
+        "row_count": int(df.shape[0]),
+    }
@@ -4,25 +4,27 @@ Configuration and environment handling.
 from __future__ import annotations
 
 import os
+import re
 from dataclasses import dataclass
 from pathlib import Path
 
+# KEY=value, KEY="value" or KEY='value'; comment lines never match since keys must start with a letter or _.
+# A trailing \r (CRLF files) is treated as whitespace.
+_ENV_LINE_RE = re.compile(
+    r"""^[ \t]*([A-Za-z_]\w*)[ \t]*=[ \t]*(?:"([^"\r\n]*)"|'([^'\r\n]*)'|(.*?))[ \t\r]*$""",
+    re.M,
+)
+
 # Load a local .env file if present (safe, only sets vars that are not already in the environment)
 _env_path = Path(__file__).resolve().parent / ".env"
 if _env_path.exists():
     try:
-        with _env_path.open("r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line or line.startswith("#"):
-                    continue
-                if "=" not in line:
-                    continue
-                key, val = line.split("=", 1)
-                key = key.strip()
-                val = val.strip().strip('"').strip("'")
-                # Do not overwrite existing environment variables
-                os.environ.setdefault(key, val)
+        text = _env_path.read_text(encoding="utf-8", errors="ignore")
+        for m in _ENV_LINE_RE.finditer(text):
+            key = m.group(1)
+            val = m.group(2) or m.group(3) or m.group(4) or ""
+            # Do not overwrite existing environment variables
+            os.environ.setdefault(key, val)
     except Exception:
         # Fail silently; environment variables may be set elsewhere
         pass
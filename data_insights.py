@@ -11,11 +11,6 @@ from datetime import datetime
 from typing import Any
 
 from config import Settings
-from io_utils import load_csv, write_insights, append_run_log
-from analysis import summarize_df
-from llm import LLMClient
-from prompts import build_prompt
-from schemas import validate_output_schema
 
 
 def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
@@ -23,7 +18,18 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
         description="Convert a CSV dataset into structured insights using an LLM."
     )
     parser.add_argument("--input", required=True, help="Path to input CSV file")
-    parser.add_argument("--question", required=True, help="Natural-language question about the data")
+    questions = parser.add_mutually_exclusive_group(required=True)
+    questions.add_argument("--question", help="Natural-language question about the data")
+    questions.add_argument(
+        "--questions-file",
+        help="Text file with one question per line; questions are answered in batched LLM calls of up to 20",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help="With --questions-file, send each question as its own request, N at a time, instead of one batch",
+    )
     parser.add_argument(
         "--model",
         default=Settings.DEFAULT_MODEL,
@@ -35,64 +41,136 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
         action="store_true",
         help="Run without calling the OpenAI API; write deterministic fake output",
     )
-    return parser.parse_args(argv)
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always call the LLM instead of reusing cached responses for identical prompts",
+    )
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=None,
+        help="Stream the CSV in chunks of N rows to bound memory (stats omit quantiles)",
+    )
+    args = parser.parse_args(argv)
+    if args.concurrency is not None and not args.questions_file:
+        parser.error("--concurrency requires --questions-file")
+    if args.concurrency is not None and args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    return args
+
+
+def read_questions(path: Path) -> list[str]:
+    """Read one question per line, skipping blank lines."""
+    with path.open("r", encoding="utf-8") as f:
+        questions = [line.strip() for line in f if line.strip()]
+    if not questions:
+        raise ValueError(f"No questions found in {path}")
+    return questions
 
 
 def main(argv: list[str] | None = None) -> int:
     args = parse_args(argv)
 
+    # Heavy dependencies (pandas, jsonschema, HTTP clients) are imported only once
+    # arguments are valid, so --help and usage errors return immediately
+    from io_utils import load_csv, write_insights, append_run_log_jsonl
+    from analysis import summarize_df
+    from llm import LLMClient
+    from prompts import build_prompt
+    from schemas import validate_output_schema
+
     input_path = Path(args.input)
     out_dir = Path(args.out)
     out_dir.mkdir(parents=True, exist_ok=True)
 
     try:
-        df = load_csv(input_path)
+        df = load_csv(input_path, chunksize=args.chunksize)
+        summary = summarize_df(df)
     except Exception as exc:
         print(f"Error loading CSV: {exc}", file=sys.stderr)
         return 2
 
-    summary = summarize_df(df)
-
-    prompt = build_prompt(
-        schema=summary["schema"],
-        sample_rows=summary["head"],
-        stats=summary["describe"],
-        question=args.question,
-    )
-
-    client = LLMClient(api_key=Settings.OPENAI_API_KEY)
-
-    response_json: dict[str, Any]
-    try:
-        response_json, token_estimate, cost_estimate = client.analyze(
-            prompt=prompt, model=args.model, dry_run=bool(args.dry_run)
+    client = LLMClient(api_key=Settings.OPENAI_API_KEY, use_cache=not args.no_cache)
+
+    results: list[tuple[str, dict[str, Any], int, float]]
+    if args.questions_file:
+        try:
+            questions = read_questions(Path(args.questions_file))
+        except Exception as exc:
+            print(f"Error reading questions file: {exc}", file=sys.stderr)
+            return 2
+        try:
+            if args.concurrency:
+                import asyncio
+
+                prompts = [
+                    build_prompt(
+                        schema=summary["schema"],
+                        sample_rows=summary["head"],
+                        stats=summary["describe"],
+                        question=q,
+                    )
+                    for q in questions
+                ]
+                answers = asyncio.run(
+                    client.analyze_many(
+                        prompts, model=args.model, dry_run=bool(args.dry_run), max_concurrency=args.concurrency
+                    )
+                )
+            else:
+                answers = client.analyze_batch(
+                    questions=questions,
+                    schema=summary["schema"],
+                    sample_rows=summary["head"],
+                    stats=summary["describe"],
+                    model=args.model,
+                    dry_run=bool(args.dry_run),
+                )
+        except Exception as exc:
+            print(f"LLM error: {exc}", file=sys.stderr)
+            return 3
+        results = [(q, *answer) for q, answer in zip(questions, answers)]
+    else:
+        prompt = build_prompt(
+            schema=summary["schema"],
+            sample_rows=summary["head"],
+            stats=summary["describe"],
+            question=args.question,
         )
-    except Exception as exc:
-        print(f"LLM error: {exc}", file=sys.stderr)
-        return 3
-
-    # Validate LLM output schema
-    valid, errors = validate_output_schema(response_json)
-    if not valid:
-        print("Warning: LLM output failed schema validation:", errors, file=sys.stderr)
-
-    insights_path = out_dir / "insights.json"
-    write_insights(insights_path, response_json)
-
-    # Append run log
-    run_log_entry = {
-        "timestamp": datetime.utcnow().isoformat() + "Z",
-        "input_file": str(input_path),
-        "question": args.question,
-        "model": args.model,
-        "row_count": summary["row_count"],
-        "estimated_tokens": token_estimate,
-        "estimated_cost_usd": cost_estimate,
-    }
-    append_run_log(out_dir / "run_log.json", run_log_entry)
-
-    print(f"Insights written to: {insights_path}")
-    print(f"Run log appended to: {out_dir / 'run_log.json'}")
+        try:
+            response_json, token_estimate, cost_estimate = client.analyze(
+                prompt=prompt, model=args.model, dry_run=bool(args.dry_run)
+            )
+        except Exception as exc:
+            print(f"LLM error: {exc}", file=sys.stderr)
+            return 3
+        results = [(args.question, response_json, token_estimate, cost_estimate)]
+
+    for i, (question, response_json, token_estimate, cost_estimate) in enumerate(results, start=1):
+        # Validate LLM output schema
+        valid, errors = validate_output_schema(response_json)
+        if not valid:
+            print("Warning: LLM output failed schema validation:", errors, file=sys.stderr)
+
+        # A single question keeps the historical insights.json name; batches are numbered
+        insights_path = out_dir / ("insights.json" if len(results) == 1 else f"insights_{i}.json")
+        write_insights(insights_path, response_json)
+
+        # Append run log
+        run_log_entry = {
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "input_file": str(input_path),
+            "question": question,
+            "model": args.model,
+            "row_count": summary["row_count"],
+            "estimated_tokens": token_estimate,
+            "estimated_cost_usd": cost_estimate,
+        }
+        run_log_path = append_run_log_jsonl(out_dir / "run_log.json", run_log_entry)
+
+        print(f"Insights written to: {insights_path}")
+    print(f"Run log appended to: {run_log_path}")
     return 0
 
 
@@ -3,16 +3,98 @@ CSV loading and output writing utilities.
 """
 from __future__ import annotations
 
-import json
+import csv
+import itertools
+import os
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
 import pandas as pd
 
+from jsonutil import dump_file, dumpb, loads
 
-def load_csv(path: Path) -> pd.DataFrame:
+try:
+    import ijson
+except ImportError:  # optional incremental parser for legacy run_log.json arrays
+    ijson = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except ImportError:  # optional multi-threaded CSV parser; pandas' C parser is used otherwise
+    pa = pa_csv = None
+
+# pd.read_csv's default NA tokens; pyarrow's own list lacks "<NA>" and "None"
+_NA_VALUES = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan", "1.#IND", "1.#QNAN",
+    "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a", "nan", "null",
+]
+
+def _dedupe_columns(names: list[str]) -> list[str]:
+    """Rename repeated column names the way pandas does (``a, a`` -> ``a, a.1``)."""
+    taken = set(names)
+    seen: set[str] = set()
+    out = []
+    for name in names:
+        if name in seen:
+            k = 1
+            while f"{name}.{k}" in taken:
+                k += 1
+            name = f"{name}.{k}"
+            taken.add(name)
+        seen.add(name)
+        out.append(name)
+    return out
+
+
+def _read_csv(path: Path) -> pd.DataFrame:
+    """Read a whole CSV with the backend named by ``LOAD_BACKEND``.
+
+    ``pyarrow`` (the default when installed) parses in parallel and keeps
+    Arrow-backed columns; ``polars`` converts via pyarrow extension arrays;
+    ``pandas`` uses ``pd.read_csv``. Duplicate headers are renamed as pandas
+    would, whichever backend is used. The pyarrow backend reads pandas' NA
+    tokens (quoted or not) as nulls in every column, and falls back to
+    ``pd.read_csv`` for files it rejects, such as ragged rows that pandas pads
+    with NaN.
+    """
+    backend = os.getenv("LOAD_BACKEND") or ("pyarrow" if pa_csv is not None else "pandas")
+    if backend == "pyarrow":
+        if pa_csv is None:
+            raise RuntimeError("LOAD_BACKEND=pyarrow requires the pyarrow package")
+        try:
+            tbl = pa_csv.read_csv(
+                str(path),
+                read_options=pa_csv.ReadOptions(use_threads=True, block_size=8 << 20),
+                convert_options=pa_csv.ConvertOptions(
+                    null_values=_NA_VALUES, strings_can_be_null=True, quoted_strings_can_be_null=True
+                ),
+            )
+        except pa.ArrowInvalid:
+            return pd.read_csv(path, engine="c", low_memory=True)
+        tbl = tbl.rename_columns(_dedupe_columns(tbl.column_names))
+        return tbl.to_pandas(split_blocks=True, self_destruct=True, types_mapper=pd.ArrowDtype)
+    if backend == "polars":
+        import polars as pl
+
+        df = pl.read_csv(path).to_pandas(use_pyarrow_extension_array=True)
+        # polars suffixes repeats with "_duplicated_N"; relabel from the raw header instead
+        with path.open(newline="", encoding="utf-8-sig") as f:
+            df.columns = _dedupe_columns(next(csv.reader(f)))
+        return df
+    if backend == "pandas":
+        return pd.read_csv(path, engine="c", low_memory=True)
+    raise ValueError(f"Unknown LOAD_BACKEND: {backend!r} (expected pyarrow, polars or pandas)")
+
+
+def load_csv(path: Path, chunksize: int | None = None) -> pd.DataFrame | pd.io.parsers.TextFileReader:
     """Load CSV into a pandas DataFrame with basic validations.
 
+    If ``chunksize`` is given, return a pandas chunk iterator instead of a
+    DataFrame so callers can stream the file; only the header is validated up
+    front and the row-count check is left to the consumer. Otherwise the file is
+    read in one go with the ``LOAD_BACKEND`` parser (see ``_read_csv``).
+
     Raises:
         FileNotFoundError: if file does not exist
         ValueError: if file has no rows or invalid column names
@@ -20,33 +102,108 @@ def load_csv(path: Path) -> pd.DataFrame:
     if not path.exists():
         raise FileNotFoundError(f"Input file not found: {path}")
 
-    df = pd.read_csv(path)
+    if chunksize:
+        header = pd.read_csv(path, nrows=0)
+        if header.columns.inferred_type != "string":
+            raise ValueError("All column names must be strings")
+        return pd.read_csv(path, chunksize=chunksize, engine="c", low_memory=True)
+
+    df = _read_csv(path)
 
     if df.shape[0] < 1:
         raise ValueError("CSV must contain at least one row")
 
-    if not all(isinstance(col, str) for col in df.columns):
+    if df.columns.inferred_type != "string":
         raise ValueError("All column names must be strings")
 
+    if not df.columns.is_unique:
+        raise ValueError("Column names must be unique")
+
     return df
 
 
 def write_insights(out_path: Path, insights: dict[str, Any]) -> None:
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    with out_path.open("w", encoding="utf-8") as f:
-        json.dump(insights, f, indent=2, ensure_ascii=False)
+    dump_file(out_path, insights, indent=os.getenv("INSIGHTS_COMPACT") != "1")
 
 
-def append_run_log(log_path: Path, entry: dict[str, Any]) -> None:
-    log_path.parent.mkdir(parents=True, exist_ok=True)
-    logs: list[dict[str, Any]] = []
-    if log_path.exists():
+def _iter_json_array(path: Path) -> Iterator[Any]:
+    """Yield the items of a top-level JSON array file.
+
+    With ijson the file is parsed incrementally, so memory stays flat and
+    callers can stop early; otherwise the whole array is loaded. Raises
+    ValueError if the file does not hold an array.
+    """
+    with path.open("rb") as f:
+        if f.read(4096).lstrip()[:1] != b"[":
+            raise ValueError(f"{path} does not contain a JSON array")
+        f.seek(0)
+        if ijson is not None:
+            yield from ijson.items(f, "item", use_float=True)
+        else:
+            yield from loads(f.read())
+
+
+def migrate_run_log(log_path: Path) -> None:
+    """One-time conversion of a legacy ``run_log.json`` array into ``run_log.jsonl``.
+
+    Entries are streamed into the JSONL file and the legacy file is renamed to
+    ``run_log.json.bak``. Unreadable legacy logs are left untouched.
+    """
+    if not log_path.exists():
+        return
+    entries = _iter_json_array(log_path)
+    try:
+        first = [next(entries)]
+    except StopIteration:
+        first = []
+    except Exception:
+        return
+    with log_path.with_suffix(".jsonl").open("ab") as f:
+        start = f.tell()
         try:
-            with log_path.open("r", encoding="utf-8") as f:
-                logs = json.load(f)
+            for entry in itertools.chain(first, entries):
+                f.write(dumpb(entry) + b"\n")
         except Exception:
-            logs = []
-    logs.append(entry)
-    with log_path.open("w", encoding="utf-8") as f:
-        json.dump(logs, f, indent=2, ensure_ascii=False)
+            # Drop any partially migrated entries
+            f.truncate(start)
+            return
+    log_path.replace(log_path.with_name(log_path.name + ".bak"))
+
 
+def append_run_log_jsonl(log_path: Path, entry: dict[str, Any]) -> Path:
+    """Append one entry as a line to the newline-delimited JSON run log.
+
+    ``log_path`` may name the legacy ``.json`` log; entries always go to the
+    ``.jsonl`` sibling, which is returned. A legacy log is migrated first.
+    """
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    if log_path.suffix == ".json":
+        migrate_run_log(log_path)
+    jsonl_path = log_path.with_suffix(".jsonl")
+    with jsonl_path.open("ab") as f:
+        f.write(dumpb(entry) + b"\n")
+    return jsonl_path
+
+
+def iter_run_log(log_path: Path) -> Iterator[dict[str, Any]]:
+    """Yield run-log entries one at a time without loading the whole log.
+
+    A ``.json`` path that still exists is read first as a legacy array (streamed
+    with ijson when available); an unreadable legacy log is skipped. The
+    ``.jsonl`` sibling, which holds every entry appended since, is then read
+    line by line.
+    """
+    jsonl_path = log_path.with_suffix(".jsonl")
+    if log_path.suffix == ".json" and log_path.exists():
+        try:
+            yield from _iter_json_array(log_path)
+        except Exception:
+            # Left in place by migrate_run_log; nothing more can be recovered from it
+            pass
+        if not jsonl_path.exists():
+            return
+    with jsonl_path.open("rb") as f:
+        for line in f:
+            if line.strip():
+                yield loads(line)
@@ -0,0 +1,51 @@
+"""
+JSON encoding/decoding shared by all modules.
+
+Uses orjson when installed and the stdlib ``json`` module otherwise. Either way
+output is compact UTF-8 (non-ASCII kept as is), non-string keys are allowed and
+anything not natively serializable is written via ``str()``.
+"""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # optional speedup; fall back to the stdlib encoder
+    orjson = None
+
+_ORJSON_OPTS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY if orjson is not None else 0
+
+loads = orjson.loads if orjson is not None else json.loads
+
+
+def dumpb(obj: Any) -> bytes:
+    """Encode ``obj`` as compact UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=_ORJSON_OPTS)
+    return json.dumps(obj, default=str, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def dumps(obj: Any) -> str:
+    """Encode ``obj`` as a compact JSON string."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=_ORJSON_OPTS).decode()
+    return json.dumps(obj, default=str, ensure_ascii=False, separators=(",", ":"))
+
+
+def dump_file(path: Path, obj: Any, indent: bool = False) -> None:
+    """Write ``obj`` to ``path`` as JSON, indented by 2 spaces if ``indent``."""
+    if orjson is not None:
+        path.write_bytes(orjson.dumps(obj, default=str, option=_ORJSON_OPTS | (orjson.OPT_INDENT_2 if indent else 0)))
+        return
+    if indent:
+        encoder = json.JSONEncoder(indent=2, default=str, ensure_ascii=False)
+    else:
+        encoder = json.JSONEncoder(separators=(",", ":"), default=str, ensure_ascii=False)
+    # Stream encoder chunks (raw_response payloads can be megabytes) through a
+    # 1 MiB buffer that coalesces the many small pieces iterencode yields
+    with path.open("w", encoding="utf-8", buffering=1 << 20) as f:
+        for chunk in encoder.iterencode(obj):
+            f.write(chunk)
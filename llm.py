@@ -3,141 +3,273 @@ OpenAI API wrapper using the Responses API style.
 
 Implements:
 - analyze(prompt, model, dry_run)
+- analyze_batch(questions, schema, sample_rows, stats, model, dry_run)
+- analyze_async(prompt, model, dry_run) / analyze_many(prompts, model, dry_run, max_concurrency)
 
-Dry-run returns deterministic fake output.
+Dry-run returns deterministic fake output. Parsed responses are cached on disk
+keyed by sha256(model + prompt) under INSIGHTS_CACHE_DIR (default
+~/.cache/data_insights).
 """
 from __future__ import annotations
 
-import json
+import hashlib
+import os
 import re
 import ast
-from typing import Any, Tuple
+from pathlib import Path
+from typing import Any, Iterator, Tuple
 
-from config import Settings
+from jsonutil import dumps, loads
+from prompts import build_batch_prompt
+from schemas import validate_output_schema
+
+# Structural tokens for the JSON scanner: a backslash escape (consumed with its
+# target character), a double quote, or a brace.
+_JSON_TOKEN_RE = re.compile(r'\\.|["{}]', re.S)
+
+# Key that marks the answer object, as a JSON string token and as its escaped form
+_ANCHOR = '"executive_summary"'
+_ESCAPED_ANCHOR = '\\"executive_summary\\"'
+
+
+def _iter_json_strings(obj: Any) -> Iterator[str]:
+    """Yield every string value nested anywhere in a parsed JSON object."""
+    if isinstance(obj, str):
+        yield obj
+    elif isinstance(obj, dict):
+        for v in obj.values():
+            yield from _iter_json_strings(v)
+    elif isinstance(obj, list):
+        for v in obj:
+            yield from _iter_json_strings(v)
+
+
+def _iter_candidate_strings(text: str) -> Iterator[str]:
+    """Yield string literals that may hold JSON from a Python-repr response.
+
+    The text is parsed once with ``ast.parse``; every string constant containing
+    a ``{`` is yielded in source order. Nothing is yielded if it is not a Python
+    expression.
+    """
+    try:
+        tree = ast.parse(text, mode="eval")
+    except (SyntaxError, ValueError, MemoryError, RecursionError):
+        return
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Constant) and isinstance(node.value, str) and "{" in node.value:
+            yield node.value
+
+
+def _cache_dir() -> Path:
+    return Path(os.getenv("INSIGHTS_CACHE_DIR") or Path.home() / ".cache" / "data_insights")
+
+
+def _cache_key(model: str, prompt: str) -> str:
+    return hashlib.sha256(f"{model}\0{prompt}".encode("utf-8")).hexdigest()
+
+
+def _cache_get(key: str) -> Any | None:
+    """Return the cached parsed response for ``key``, or None on a miss or unreadable entry."""
+    try:
+        return loads((_cache_dir() / f"{key}.json").read_bytes())
+    except Exception:
+        return None
+
+
+def _cache_put(key: str, obj: Any) -> None:
+    """Store a parsed response; failures are ignored since the cache is only an optimization."""
+    try:
+        cache_dir = _cache_dir()
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp = cache_dir / f"{key}.{os.getpid()}.tmp"
+        tmp.write_text(dumps(obj), encoding="utf-8")
+        tmp.replace(cache_dir / f"{key}.json")
+    except Exception:
+        pass
+
+
+# Deterministic --dry-run payload, built once and shared by every call; treat as read-only
+_DRY_RUN_FAKE: dict[str, Any] = {
+    "executive_summary": "Revenue dropped in Q3 primarily due to seasonal decline and lower repeat purchases.",
+    "key_insights": [
+        "Quarter-over-quarter revenue decreased by 12%",
+        "Top product category saw a 20% drop in units sold",
+    ],
+    "suggested_charts": [
+        {"chart_type": "line", "columns": ["date", "revenue"], "reason": "Trend over time shows Q3 drop"},
+        {"chart_type": "bar", "columns": ["product_category", "units_sold"], "reason": "Compare category performance"},
+    ],
+    "analysis_notes": "Recommend checking marketing spend and returns data; consider cohort analysis.",
+    "limitations": "Analysis is based on summary stats and sample rows; full data may reveal different patterns.",
+}
+
+# Retry policy shared by the sync (urllib3 Retry) and async HTTP paths
+_RETRY_TOTAL = 2
+_RETRY_BACKOFF = 0.3
+_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Output-token budget per batched answer, and the model's max_output_tokens ceiling
+# (16,384 for gpt-4o-mini); larger question lists are split into several calls
+_BATCH_TOKENS_PER_ANSWER = 800
+_MAX_OUTPUT_TOKENS = 16_384
+_MAX_BATCH = _MAX_OUTPUT_TOKENS // _BATCH_TOKENS_PER_ANSWER
+
+_REPAIR_SUFFIX = "\n\nIf your previous response was not valid JSON, please output only the corrected JSON object now."
 
 
 class LLMClient:
-    def __init__(self, api_key: str | None = None) -> None:
-        self.api_key = api_key or Settings.OPENAI_API_KEY
+    def __init__(self, api_key: str | None = None, use_cache: bool = True) -> None:
+        from config import Settings
 
-    def _extract_json_substring(self, text: str) -> str | None:
-        """Try to extract the first JSON object substring from a noisy string.
+        self.api_key = api_key or Settings.OPENAI_API_KEY
+        self.use_cache = use_cache
+        self._session = None
+        self._aclient = None
 
-        Returns the JSON substring if found, otherwise None.
-        """
-        if not text:
+    @staticmethod
+    def _python_text_literal(text: str) -> str | None:
+        """Return the value of a Python-repr ``'text': '...'`` field, if present."""
+        idx = text.find("'text'")
+        if idx == -1:
             return None
-
-        # Helper: extract balanced JSON object starting from a left brace
-        def _balanced_from(start_idx: int) -> str | None:
-            depth = 0
-            in_str = False
-            esc = False
-            for i in range(start_idx, len(text)):
-                ch = text[i]
-                if ch == '"' and not esc:
-                    in_str = not in_str
-                if in_str and ch == '\\' and not esc:
-                    esc = True
-                    continue
-                esc = False
-                if not in_str:
-                    if ch == '{':
-                        depth += 1
-                    elif ch == '}':
-                        depth -= 1
-                        if depth == 0:
-                            return text[start_idx:i + 1]
+        i = idx + len("'text'")
+        n = len(text)
+        while i < n and text[i].isspace():
+            i += 1
+        if i >= n or text[i] != ":":
             return None
-
-        # 1) Look for a JSON object that contains the key "executive_summary" (likely the desired object)
-        # Try a regex that captures an object containing the anchor (greedy to the closing brace)
-        m_anchor = re.search(r'(\{[\s\S]*"executive_summary"[\s\S]*\})', text, re.S)
-        if m_anchor:
-            frag = m_anchor.group(1)
-            # If the fragment is itself quoted (e.g., "{...}" or '{...}'), unquote it to get valid JSON
-            frag_stripped = frag
-            if (frag_stripped.startswith("'") and frag_stripped.endswith("'")) or (
-                frag_stripped.startswith('"') and frag_stripped.endswith('"')
-            ):
+        i += 1
+        while i < n and text[i].isspace():
+            i += 1
+        if i >= n or text[i] not in "'\"":
+            return None
+        quote = text[i]
+        j = i + 1
+        while j < n:
+            if text[j] == "\\":
+                j += 2
+                continue
+            if text[j] == quote:
                 try:
-                    frag_stripped = ast.literal_eval(frag_stripped)
+                    inner = ast.literal_eval(text[i:j + 1])  # safely evaluate the Python string literal
                 except Exception:
-                    # fall back to raw fragment
-                    pass
-            return frag_stripped
-
-        # 2) First, try to find a JSON object that uses double-quoted keys (most likely valid JSON)
-        m = re.search(r'(\{\s*"[^"\n]+"\s*:\s*[\s\S]*?\})', text, re.S)
-        if m:
-            return m.group(1)
-
-        # 3) Next, try to extract an inner 'text' field from a Python-style repr like "{'text': '{\"k\": \"v\"}'}" or "\"text\": \"{...}\""
-        m2 = re.search(r"'text'\s*:\s*(?P<quoted>'(?:\\.|[^'])*')", text, re.S)
-        if m2:
-            quoted = m2.group('quoted')
+                    return None
+                return inner if isinstance(inner, str) else None
+            j += 1
+        return None
+
+    def _escaped_anchor(self, frag: str) -> str | None:
+        """Find an anchored object that was embedded as an escaped JSON string.
+
+        Handles both a bare escaped object (``{\\"executive_summary\\": ...}``) and
+        one held in a string value of an outer object (``{"text": "{\\"executive_summary\\"...}"}``).
+        """
+        try:
+            decoded = loads(f'"{frag}"')
+        except Exception:
             try:
-                inner = ast.literal_eval(quoted)  # safely evaluate the Python string literal
-                return inner
+                obj = loads(frag)
             except Exception:
-                # fall through to other heuristics
-                pass
-        m3 = re.search(r'"text"\s*:\s*"(?P<inner>\\?\{[\s\S]*?\\?\})"', text, re.S)
-        if m3:
-            # unescape surrounding quotes/backslashes if present
-            inner = m3.group('inner')
-            inner = inner.replace('\\n', '\n').replace('\\"', '"')
-            return inner
-
-        # Fallback: find the first balanced braces block that looks like an object
-        m4 = re.search(r"(\{[\s\S]*?\})", text, re.S)
-        if m4:
-            return m4.group(1)
-        return None
+                return None
+            decoded = next((v for v in _iter_json_strings(obj) if _ANCHOR in v), None)
+        if not isinstance(decoded, str) or _ANCHOR not in decoded:
+            return None
+        return self._extract_json_substring(decoded)
 
-    def analyze(self, prompt: str, model: str = "gpt-4o-mini", dry_run: bool = False) -> Tuple[dict[str, Any], int, float]:
-        """Send prompt to LLM and return parsed JSON, estimated tokens, and rough cost in USD.
+    def _extract_json_substring(self, text: str) -> str | None:
+        """Try to extract the first JSON object substring from a noisy string.
 
-        If dry_run is True, return deterministic fake output without calling any external API.
+        Makes one left-to-right pass over the structural tokens, keeping a stack
+        of open braces, and checks each object as it closes (so an inner object
+        is seen before the wrappers around it). The first closed object with an
+        "executive_summary" key that parses as JSON, or that holds an escaped copy
+        of one, wins. Quotes and stray ``}`` outside any object are ignored and
+        unclosed ``{`` are simply left on the stack. Once an object fails to parse
+        its enclosing objects are not tried again, so the scan stays linear. If
+        nothing anchored is found, the value of a Python-repr ``'text': '...'``
+        field is searched, then the outermost anchored or first balanced object
+        seen is returned.
+
+        Returns the JSON substring if found, otherwise None.
         """
-        if dry_run:
-            fake = {
-                "executive_summary": "Revenue dropped in Q3 primarily due to seasonal decline and lower repeat purchases.",
-                "key_insights": [
-                    "Quarter-over-quarter revenue decreased by 12%",
-                    "Top product category saw a 20% drop in units sold",
-                ],
-                "suggested_charts": [
-                    {"chart_type": "line", "columns": ["date", "revenue"], "reason": "Trend over time shows Q3 drop"},
-                    {"chart_type": "bar", "columns": ["product_category", "units_sold"], "reason": "Compare category performance"},
-                ],
-                "analysis_notes": "Recommend checking marketing spend and returns data; consider cohort analysis.",
-                "limitations": "Analysis is based on summary stats and sample rows; full data may reveal different patterns.",
-            }
-            return fake, 50, 0.0025
+        if not text:
+            return None
 
-        # Minimal external API interaction: use requests to call OpenAI Responses API if key present.
-        if not self.api_key:
-            raise RuntimeError("OpenAI API key not configured. Set OPENAI_API_KEY or use --dry-run")
+        # One frame per open brace: [start, has_anchor, has_escaped_anchor, failed]
+        stack: list[list[Any]] = []
+        anchored: tuple[int, int] | None = None
+        first_obj: tuple[int, int] | None = None
+        str_start = -1  # offset of the opening quote while inside a string
+        for m in _JSON_TOKEN_RE.finditer(text):
+            tok = m.group()
+            if not stack:
+                if tok == "{":
+                    stack.append([m.start(), False, False, False])
+                continue
+            top = stack[-1]
+            if tok[0] == "\\":
+                if tok == '\\"' and text.startswith(_ESCAPED_ANCHOR, m.start()):
+                    top[2] = True
+            elif str_start >= 0:
+                if tok == '"':
+                    if m.end() - str_start == len(_ANCHOR) and text.startswith(_ANCHOR, str_start):
+                        top[1] = True
+                    str_start = -1
+            elif tok == '"':
+                str_start = m.start()
+            elif tok == "{":
+                stack.append([m.start(), False, False, False])
+            else:
+                start, has_anchor, has_escaped, failed = stack.pop()
+                end = m.end()
+                # An object containing one that failed cannot parse either
+                if not failed and (has_anchor or has_escaped):
+                    frag = text[start:end]
+                    if has_anchor:
+                        try:
+                            loads(frag)
+                            return frag
+                        except Exception:
+                            failed = True
+                    if has_escaped:
+                        inner = self._escaped_anchor(frag)
+                        if inner is not None:
+                            return inner
+                        failed = True
+                if has_anchor and (anchored is None or start < anchored[0]):
+                    anchored = (start, end)
+                if first_obj is None or start < first_obj[0]:
+                    first_obj = (start, end)
+                if stack:
+                    parent = stack[-1]
+                    parent[1] = parent[1] or has_anchor
+                    parent[2] = parent[2] or has_escaped
+                    parent[3] = parent[3] or failed
 
-        # For this project we avoid adding an external OpenAI SDK dependency; instead we make a simple HTTP call.
-        # However, network calls are intentionally kept minimal here. If you prefer, swap to official SDK.
-        import requests
+        # Python-style repr like "{'text': '...'}" whose string holds the object
+        inner = self._python_text_literal(text)
+        if inner is not None:
+            frag = self._extract_json_substring(inner)
+            if frag is not None:
+                return frag
+        span = anchored or first_obj
+        return text[span[0] : span[1]] if span is not None else None
 
-        url = "https://api.openai.com/v1/responses"
-        headers = {"Authorization": f"Bearer {self.api_key}", "Content-Type": "application/json"}
-        body = {
-            "model": model,
-            "input": prompt,
-            "max_output_tokens": 800,
+    @staticmethod
+    def _parse_error(limitations: str, raw: str | None) -> dict[str, Any]:
+        """Schema-shaped payload returned when the LLM response cannot be parsed."""
+        return {
+            "executive_summary": "",
+            "key_insights": [],
+            "suggested_charts": [],
+            "analysis_notes": "",
+            "limitations": limitations,
+            "raw_response": raw,
         }
 
-        resp = requests.post(url, headers=headers, json=body, timeout=30)
-        resp.raise_for_status()
-        data = resp.json()
-
-        # Extract text from the response in a robust way
-        text = None
+    @staticmethod
+    def _response_text(data: dict[str, Any]) -> str | None:
+        """Extract the model's text from a Responses/Chat Completions payload."""
         # Responses API may contain outputs in different places; try common locations
         if "output" in data and isinstance(data["output"], list) and data["output"]:
             # Some Responses API variants put content under 'content' or 'text' keys inside items
@@ -150,7 +282,7 @@ class LLMClient:
                         subparts = []
                         for elem in val:
                             if isinstance(elem, dict):
-                                subparts.append(elem.get("content") or elem.get("text") or json.dumps(elem))
+                                subparts.append(elem.get("content") or elem.get("text") or dumps(elem))
                             else:
                                 subparts.append(str(elem))
                         parts.append("\n".join([s for s in subparts if s]))
@@ -158,119 +290,346 @@ class LLMClient:
                         parts.append(str(val))
                 else:
                     parts.append(str(x))
-            text = "\n".join([p for p in parts if p])
-        elif "choices" in data and data["choices"]:
+            return "\n".join([p for p in parts if p])
+        if "choices" in data and data["choices"]:
             first = data["choices"][0]
             if isinstance(first, dict):
-                text = (first.get("message", {}) or {}).get("content") or first.get("text")
-            else:
-                text = str(first)
-        else:
-            text = json.dumps(data)
+                return (first.get("message", {}) or {}).get("content") or first.get("text")
+            return str(first)
+        return dumps(data)
 
-        # Try parsing JSON; if it fails, attempt to extract a JSON substring before retrying with a repair instruction
-        parsed = None
+    def _loads_or_extract(self, text: str) -> Any | None:
+        """Parse ``text`` as JSON, or the first JSON object embedded in it; None on failure."""
         try:
-            parsed = json.loads(text)
+            return loads(text)
         except Exception:
-            # If the response looks like a Python repr (list/dict with single quotes), try ast.literal_eval
+            pass
+        frag = self._extract_json_substring(text)
+        if frag:
             try:
-                pyobj = ast.literal_eval(text)
-                candidates = []
-                if isinstance(pyobj, (list, tuple)):
-                    for it in pyobj:
-                        if isinstance(it, dict):
-                            if 'text' in it and isinstance(it['text'], str):
-                                candidates.append(it['text'])
-                            if 'content' in it and isinstance(it['content'], str):
-                                candidates.append(it['content'])
-                elif isinstance(pyobj, dict):
-                    if 'text' in pyobj and isinstance(pyobj['text'], str):
-                        candidates.append(pyobj['text'])
-                    if 'content' in pyobj and isinstance(pyobj['content'], str):
-                        candidates.append(pyobj['content'])
-
-                for cand in candidates:
-                    # cand may be a JSON string; try to load it directly
-                    try:
-                        parsed = json.loads(cand)
-                        break
-                    except Exception:
-                        # try extracting JSON substring from candidate
-                        frag = self._extract_json_substring(cand)
-                        if frag:
-                            try:
-                                parsed = json.loads(frag)
-                                break
-                            except Exception:
-                                pass
+                return loads(frag)
             except Exception:
-                # Not a Python literal; fall back to substring heuristics below
                 pass
+        return None
 
-            if parsed is None:
-                # Attempt to find a JSON object inside the returned text
-                json_fragment = self._extract_json_substring(text)
-                if json_fragment:
-                    try:
-                        parsed = json.loads(json_fragment)
-                    except Exception:
-                        parsed = None
-
-        if parsed is None:
-            # Retry with a repair instruction appended
-            repair_prompt = prompt + "\n\nIf your previous response was not valid JSON, please output only the corrected JSON object now."
-            body["input"] = repair_prompt
-            resp = requests.post(url, headers=headers, json=body, timeout=30)
-            resp.raise_for_status()
-            data2 = resp.json()
-            text2 = None
-            if "output" in data2 and isinstance(data2["output"], list) and data2["output"]:
-                parts = []
-                for x in data2["output"]:
-                    if isinstance(x, dict):
-                        parts.append(x.get("content") or x.get("text") or "")
-                    else:
-                        parts.append(str(x))
-                text2 = "\n".join([p for p in parts if p])
-            elif "choices" in data2 and data2["choices"]:
-                first = data2["choices"][0]
-                if isinstance(first, dict):
-                    text2 = (first.get("message", {}) or {}).get("content") or first.get("text")
-                else:
-                    text2 = str(first)
-            else:
-                text2 = json.dumps(data2)
+    def _parse_text(self, text: str) -> Any | None:
+        """Parse JSON from model text, tolerating Python reprs and surrounding noise.
 
-            # Try JSON substring extraction on the repair response as well
+        Returns None if nothing parseable is found.
+        """
+        try:
+            return loads(text)
+        except Exception:
+            pass
+
+        # If the response looks like a Python repr (list/dict with single quotes), walk its string
+        # literals once. Only a candidate satisfying the output schema is accepted; anything else
+        # falls through to whole-text extraction and, failing that, the repair retry
+        for cand in _iter_candidate_strings(text):
+            parsed = self._loads_or_extract(cand)
+            if parsed is not None and validate_output_schema(parsed)[0]:
+                return parsed
+
+        # Attempt to find a JSON object inside the returned text
+        json_fragment = self._extract_json_substring(text)
+        if json_fragment:
             try:
-                parsed = json.loads(text2)
+                return loads(json_fragment)
             except Exception:
-                json_fragment2 = self._extract_json_substring(text2)
-                if json_fragment2:
-                    try:
-                        parsed = json.loads(json_fragment2)
-                    except Exception as exc:
-                        parsed = {
-                            "executive_summary": "",
-                            "key_insights": [],
-                            "suggested_charts": [],
-                            "analysis_notes": "",
-                            "limitations": f"LLM JSON parse error: {exc}; raw response included",
-                            "raw_response": text2,
-                        }
-                else:
-                    parsed = {
-                        "executive_summary": "",
-                        "key_insights": [],
-                        "suggested_charts": [],
-                        "analysis_notes": "",
-                        "limitations": "LLM JSON parse error: response could not be parsed and no JSON fragment found; raw response included",
-                        "raw_response": text2,
-                    }
+                return None
+        return None
+
+    def _get_session(self):
+        """Return a keep-alive ``requests.Session``, created on first use.
+
+        Reusing one session pools the TCP/TLS connection across the primary and
+        repair calls (and across questions). Created lazily so dry runs never
+        import requests.
+        """
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            from urllib3.util import Retry
+
+            retry = Retry(
+                total=_RETRY_TOTAL,
+                backoff_factor=_RETRY_BACKOFF,
+                status_forcelist=_RETRY_STATUSES,
+                allowed_methods=("POST",),
+                # Hand the final error response back so raise_for_status() reports it
+                raise_on_status=False,
+            )
+            session = requests.Session()
+            session.mount("https://", HTTPAdapter(pool_maxsize=16, max_retries=retry))
+            session.headers.update({"Authorization": f"Bearer {self.api_key}", "Content-Type": "application/json"})
+            self._session = session
+        return self._session
+
+    def _post(self, body: dict[str, Any]) -> str | None:
+        """POST a request body to the Responses API and return the response text."""
+        # For this project we avoid adding an external OpenAI SDK dependency; instead we make a simple HTTP call.
+        # However, network calls are intentionally kept minimal here. If you prefer, swap to official SDK.
+        url = "https://api.openai.com/v1/responses"
+        resp = self._get_session().post(url, json=body, timeout=30)
+        resp.raise_for_status()
+        return self._response_text(loads(resp.content))
+
+    @staticmethod
+    def _cacheable(parsed: Any, batch_size: int | None = None) -> bool:
+        """True if ``parsed`` is a good answer worth reusing.
+
+        A single reply must pass OUTPUT_SCHEMA and not be a parse-error payload; a
+        batch reply must hold such an answer under every key "1".."batch_size".
+        """
+        if batch_size is not None:
+            return isinstance(parsed, dict) and all(
+                LLMClient._cacheable(parsed.get(str(i))) for i in range(1, batch_size + 1)
+            )
+        return isinstance(parsed, dict) and "raw_response" not in parsed and validate_output_schema(parsed)[0]
+
+    def _cache_lookup(self, prompt: str, model: str, batch_size: int | None = None) -> Any | None:
+        if not self.use_cache:
+            return None
+        cached = _cache_get(_cache_key(model, prompt))
+        # Entries that are no longer acceptable count as a miss, so a fresh call can replace them
+        return cached if cached is not None and self._cacheable(cached, batch_size) else None
+
+    def _cache_store(self, prompt: str, model: str, parsed: Any, batch_size: int | None = None) -> None:
+        # Parse errors and schema-invalid replies are not cached so the next run retries the call
+        if self.use_cache and self._cacheable(parsed, batch_size):
+            _cache_put(_cache_key(model, prompt), parsed)
+
+    def _request_body(self, prompt: str, model: str, max_output_tokens: int) -> dict[str, Any]:
+        # Minimal external API interaction: use requests to call OpenAI Responses API if key present.
+        if not self.api_key:
+            raise RuntimeError("OpenAI API key not configured. Set OPENAI_API_KEY or use --dry-run")
+        return {
+            "model": model,
+            "input": prompt,
+            "max_output_tokens": max_output_tokens,
+        }
+
+    def _parse_repair_text(self, text2: str | None) -> Any:
+        """Parse the reply to the repair prompt, falling back to a parse-error payload."""
+        # Try JSON substring extraction on the repair response as well
+        try:
+            return loads(text2)
+        except Exception:
+            json_fragment2 = self._extract_json_substring(text2)
+            if json_fragment2:
+                try:
+                    return loads(json_fragment2)
+                except Exception as exc:
+                    return self._parse_error(f"LLM JSON parse error: {exc}; raw response included", text2)
+            return self._parse_error(
+                "LLM JSON parse error: response could not be parsed and no JSON fragment found; raw response included",
+                text2,
+            )
+
+    def _complete_json(self, prompt: str, model: str, max_output_tokens: int) -> Any:
+        """Call the LLM and parse its JSON reply, retrying once with a repair instruction."""
+        body = self._request_body(prompt, model, max_output_tokens)
+        text = self._post(body)
+
+        # Try parsing JSON; if it fails, attempt to extract a JSON substring before retrying with a repair instruction
+        parsed = self._parse_text(text) if text else None
+        if parsed is not None:
+            return parsed
+
+        # Retry with a repair instruction appended
+        body["input"] = prompt + _REPAIR_SUFFIX
+        return self._parse_repair_text(self._post(body))
+
+    def _get_aclient(self):
+        """Return the shared ``httpx.AsyncClient``, created on first use (close with ``aclose``)."""
+        if self._aclient is None:
+            import httpx
+
+            self._aclient = httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(max_connections=16),
+                headers={"Authorization": f"Bearer {self.api_key}", "Content-Type": "application/json"},
+                timeout=30,
+            )
+        return self._aclient
+
+    async def aclose(self) -> None:
+        """Close the async HTTP client, if one was opened."""
+        if self._aclient is not None:
+            await self._aclient.aclose()
+            self._aclient = None
+
+    async def _apost(self, body: dict[str, Any]) -> str | None:
+        """Async counterpart of ``_post``.
+
+        Mirrors the sync session's retry policy: up to _RETRY_TOTAL retries on
+        429/5xx responses and transport errors, with exponential backoff (a
+        numeric Retry-After header is honoured when larger).
+        """
+        import asyncio
+        import httpx
+
+        url = "https://api.openai.com/v1/responses"
+        client = self._get_aclient()
+        for attempt in range(_RETRY_TOTAL + 1):
+            delay = _RETRY_BACKOFF * (2 ** attempt)
+            try:
+                resp = await client.post(url, json=body)
+            except httpx.TransportError:
+                if attempt == _RETRY_TOTAL:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            if resp.status_code not in _RETRY_STATUSES or attempt == _RETRY_TOTAL:
+                break
+            try:
+                delay = max(delay, float(resp.headers.get("Retry-After", 0)))
+            except ValueError:
+                pass
+            await asyncio.sleep(delay)
+        resp.raise_for_status()
+        return self._response_text(loads(resp.content))
+
+    async def _acomplete_json(self, prompt: str, model: str, max_output_tokens: int) -> Any:
+        """Async counterpart of ``_complete_json``."""
+        body = self._request_body(prompt, model, max_output_tokens)
+        text = await self._apost(body)
+        parsed = self._parse_text(text) if text else None
+        if parsed is not None:
+            return parsed
+        body["input"] = prompt + _REPAIR_SUFFIX
+        return self._parse_repair_text(await self._apost(body))
+
+    def analyze(self, prompt: str, model: str = "gpt-4o-mini", dry_run: bool = False) -> Tuple[dict[str, Any], int, float]:
+        """Send prompt to LLM and return parsed JSON, estimated tokens, and rough cost in USD.
+
+        If dry_run is True, return deterministic fake output without calling any external API.
+        """
+        if dry_run:
+            return _DRY_RUN_FAKE, 50, 0.0025
 
         # Very rough token & cost estimate
         token_estimate = int(len(prompt) / 4 + 800)
+
+        # Identical model + prompt: reuse the stored answer without a network call
+        cached = self._cache_lookup(prompt, model)
+        if cached is not None:
+            return cached, token_estimate, 0.0
+
+        parsed = self._complete_json(prompt, model, 800)
+        self._cache_store(prompt, model, parsed)
+        cost_estimate = round(token_estimate * 0.000001, 6)
+
+        return parsed, token_estimate, cost_estimate
+
+    async def analyze_async(
+        self, prompt: str, model: str = "gpt-4o-mini", dry_run: bool = False
+    ) -> Tuple[dict[str, Any], int, float]:
+        """Async variant of ``analyze`` using a pooled ``httpx.AsyncClient``."""
+        if dry_run:
+            return _DRY_RUN_FAKE, 50, 0.0025
+
+        token_estimate = int(len(prompt) / 4 + 800)
+
+        cached = self._cache_lookup(prompt, model)
+        if cached is not None:
+            return cached, token_estimate, 0.0
+
+        parsed = await self._acomplete_json(prompt, model, 800)
+        self._cache_store(prompt, model, parsed)
         cost_estimate = round(token_estimate * 0.000001, 6)
 
         return parsed, token_estimate, cost_estimate
+
+    async def analyze_many(
+        self,
+        prompts: list[str],
+        model: str = "gpt-4o-mini",
+        dry_run: bool = False,
+        max_concurrency: int = 4,
+    ) -> list[Tuple[dict[str, Any], int, float]]:
+        """Run ``analyze_async`` for each prompt concurrently, at most ``max_concurrency`` at a time.
+
+        Results are returned in prompt order. A prompt whose request fails (after
+        retries) yields a parse-error payload describing the error instead of
+        cancelling the others. The async client is closed afterwards.
+        """
+        import asyncio
+
+        if not dry_run and not self.api_key:
+            raise RuntimeError("OpenAI API key not configured. Set OPENAI_API_KEY or use --dry-run")
+
+        sem = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def _one(prompt: str) -> Tuple[dict[str, Any], int, float]:
+            async with sem:
+                try:
+                    return await self.analyze_async(prompt, model=model, dry_run=dry_run)
+                except Exception as exc:
+                    return self._parse_error(f"LLM request failed: {exc}", None), 0, 0.0
+
+        try:
+            return list(await asyncio.gather(*(_one(p) for p in prompts)))
+        finally:
+            await self.aclose()
+
+    def analyze_batch(
+        self,
+        questions: list[str],
+        schema: dict[str, list[str]],
+        sample_rows: list[dict[str, Any]],
+        stats: dict[str, Any],
+        model: str = "gpt-4o-mini",
+        dry_run: bool = False,
+    ) -> list[Tuple[dict[str, Any], int, float]]:
+        """Answer several questions about one dataset with a single LLM call.
+
+        The dataset block is sent once per call. More than _MAX_BATCH questions
+        are split into consecutive calls so the requested output tokens stay
+        within _MAX_OUTPUT_TOKENS. Returns one ``(parsed, tokens, cost)`` tuple
+        per question, in order; each call's input tokens are apportioned by
+        question length.
+        """
+        if not questions:
+            return []
+        if dry_run:
+            return [(_DRY_RUN_FAKE, 50, 0.0025) for _ in questions]
+        if len(questions) > _MAX_BATCH:
+            return [
+                result
+                for start in range(0, len(questions), _MAX_BATCH)
+                for result in self.analyze_batch(
+                    questions[start : start + _MAX_BATCH], schema, sample_rows, stats, model=model
+                )
+            ]
+
+        prompt = build_batch_prompt(schema=schema, sample_rows=sample_rows, stats=stats, questions=questions)
+        outer = self._cache_lookup(prompt, model, batch_size=len(questions))
+        cache_hit = outer is not None
+        if not cache_hit:
+            outer = self._complete_json(prompt, model, _BATCH_TOKENS_PER_ANSWER * len(questions))
+            self._cache_store(prompt, model, outer, batch_size=len(questions))
+        raw = outer.get("raw_response") if isinstance(outer, dict) else None
+
+        input_tokens = len(prompt) / 4
+        total_q_len = sum(len(q) for q in questions) or 1
+        results: list[Tuple[dict[str, Any], int, float]] = []
+        for i, question in enumerate(questions, start=1):
+            answer = outer.get(str(i)) if isinstance(outer, dict) else None
+            if answer is None:
+                answer = self._parse_error(
+                    f"LLM batch response has no answer for question {i}; raw response included",
+                    raw if raw is not None else dumps(outer),
+                )
+            else:
+                valid, errors = validate_output_schema(answer)
+                if not valid:
+                    answer = self._parse_error(
+                        f"LLM batch answer {i} failed schema validation: {errors[0].splitlines()[0]}; raw answer included",
+                        dumps(answer),
+                    )
+            # Very rough token & cost estimate: share of the prompt plus this answer's length
+            token_estimate = int(input_tokens * len(question) / total_q_len + len(dumps(answer)) / 4)
+            cost_estimate = 0.0 if cache_hit else round(token_estimate * 0.000001, 6)
+            results.append((answer, token_estimate, cost_estimate))
+        return results
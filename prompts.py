@@ -2,30 +2,89 @@
 Prompt templates for LLM interaction.
 """
 from __future__ import annotations
+
 from typing import Any
 
+from jsonutil import dumps
 
-def build_prompt(schema: list[dict[str, str]], sample_rows: list[dict[str, Any]], stats: dict[str, Any], question: str) -> str:
-    """Construct a prompt that includes schema, samples, stats, and the user's question.
 
-    The prompt instructs the model to return strict JSON conforming to the project's schema.
+# Caps on what is sent to the LLM; wide or text-heavy datasets otherwise blow up input tokens
+MAX_COLS = 20
+MAX_ROWS = 5
+MAX_STR = 64
+
+
+def _dataset_block(schema: dict[str, list[str]], sample_rows: list[dict[str, Any]], stats: dict[str, Any]) -> str:
+    """Render the schema, sample rows and describe stats shared by all prompts.
+
+    Only the first MAX_COLS columns, MAX_ROWS rows and MAX_STR characters of each
+    string value are included.
     """
-    prompt = (
-        "You are a data analyst assistant. Do NOT return any explanation outside of the JSON object.\n"
-        "Return STRICT JSON with the following keys: executive_summary, key_insights, suggested_charts, analysis_notes, limitations.\n"
-        "Respond in JSON only.\n\n"
+    columns = schema["columns"]
+    kept = set(columns[:MAX_COLS])
+    omitted = len(columns) - len(kept)
+    rows = [
+        {k: (v[:MAX_STR] if isinstance(v, str) else v) for k, v in row.items() if k in kept}
+        for row in sample_rows[:MAX_ROWS]
+    ]
+    stats_s = dumps({k: v for k, v in stats.items() if k in kept})
+    return (
         "Dataset schema:\n"
-        f"{schema}\n\n"
+        f"columns: {dumps(columns[:MAX_COLS])}\n"
+        f"dtypes: {dumps(schema['dtypes'][:MAX_COLS])}\n"
+        + (f"({omitted} more columns omitted)\n" if omitted > 0 else "")
+        + "\n"
         "Sample rows:\n"
-        f"{sample_rows}\n\n"
+        f"{dumps(rows)}\n\n"
         "Summary statistics (describe):\n"
-        f"{stats}\n\n"
-        "User question:\n"
-        f"{question}\n\n"
-        "Notes:\n"
-        "- Do not attempt to run code.\n"
-        "- Keep outputs concise and factual.\n"
-        "- When suggesting charts, include chart_type, columns, and reason.\n"
+        f"{stats_s}\n\n"
     )
-    return prompt
 
+
+_NOTES = (
+    "Notes:\n"
+    "- Do not attempt to run code.\n"
+    "- Keep outputs concise and factual.\n"
+    "- When suggesting charts, include chart_type, columns, and reason.\n"
+)
+
+
+_PROMPT_TEMPLATE = (
+    "You are a data analyst assistant. Do NOT return any explanation outside of the JSON object.\n"
+    "Return STRICT JSON with the following keys: executive_summary, key_insights, suggested_charts, analysis_notes, limitations.\n"
+    "Respond in JSON only.\n\n"
+    "{dataset}"
+    "User question:\n"
+    "{question}\n\n"
+) + _NOTES
+
+_BATCH_PROMPT_TEMPLATE = (
+    "You are a data analyst assistant. Do NOT return any explanation outside of the JSON object.\n"
+    "Answer each numbered question below independently.\n"
+    'Return STRICT JSON: a single object whose keys are the question numbers as strings ("1", "2", ...). '
+    "Each value must be an object with the following keys: executive_summary, key_insights, suggested_charts, analysis_notes, limitations.\n"
+    "Respond in JSON only.\n\n"
+    "{dataset}"
+    "User questions:\n"
+    "{questions}\n"
+) + _NOTES
+
+
+def build_prompt(schema: dict[str, list[str]], sample_rows: list[dict[str, Any]], stats: dict[str, Any], question: str) -> str:
+    """Construct a prompt that includes schema, samples, stats, and the user's question.
+
+    The prompt instructs the model to return strict JSON conforming to the project's schema.
+    """
+    return _PROMPT_TEMPLATE.format(dataset=_dataset_block(schema, sample_rows, stats), question=question)
+
+
+def build_batch_prompt(
+    schema: dict[str, list[str]], sample_rows: list[dict[str, Any]], stats: dict[str, Any], questions: list[str]
+) -> str:
+    """Construct one prompt answering several numbered questions about the same dataset.
+
+    The dataset block is emitted once; the model is asked for a JSON object keyed by
+    question number ("1", "2", ...) whose values follow the project's output schema.
+    """
+    numbered = "".join(f"[Q{i}] {q}\n" for i, q in enumerate(questions, start=1))
+    return _BATCH_PROMPT_TEMPLATE.format(dataset=_dataset_block(schema, sample_rows, stats), questions=numbered)
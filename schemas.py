@@ -4,7 +4,6 @@ JSON schema validation for LLM outputs.
 from __future__ import annotations
 
 from typing import Any, Tuple
-import jsonschema
 
 
 OUTPUT_SCHEMA = {
@@ -37,10 +36,23 @@ OUTPUT_SCHEMA = {
 }
 
 
-def validate_output_schema(obj: Any) -> Tuple[bool, list[str]]:
-    try:
-        jsonschema.validate(instance=obj, schema=OUTPUT_SCHEMA)
-        return True, []
-    except jsonschema.ValidationError as exc:
-        return False, [str(exc)]
+_VALIDATOR = None
+
+
+def _get_validator():
+    """Compile OUTPUT_SCHEMA once; jsonschema.validate() would rebuild the validator per call.
+
+    jsonschema is imported here rather than at module load to keep CLI start-up fast.
+    """
+    global _VALIDATOR
+    if _VALIDATOR is None:
+        import jsonschema
 
+        jsonschema.Draft202012Validator.check_schema(OUTPUT_SCHEMA)
+        _VALIDATOR = jsonschema.Draft202012Validator(OUTPUT_SCHEMA)
+    return _VALIDATOR
+
+
+def validate_output_schema(obj: Any) -> Tuple[bool, list[str]]:
+    errors = list(_get_validator().iter_errors(obj))
+    return not errors, [str(e) for e in errors]